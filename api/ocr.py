@@ -1,131 +1,541 @@
 import os
+import asyncio
 import cv2
 import numpy as np
-import pytesseract
-from flask import Flask, request, jsonify, render_template
-from werkzeug.utils import secure_filename
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from tesserocr import PyTessBaseAPI, PSM, OEM
+from quart import Quart, request, jsonify, render_template
 import json
 import re
-from googletrans import Translator
+from collections import OrderedDict
+from google.cloud import translate_v3 as translate
 import logging
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    # Some platforms lack POSIX shared memory; OCR then runs in-process
+    shared_memory = None
+
+try:
+    # RE2 matches in linear time without backtracking; fall back to the stdlib engine
+    import re2 as regex_engine
+except ImportError:
+    regex_engine = re
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__, template_folder='../templates')
+app = Quart(__name__, template_folder='../templates')
 
 # Configuration
-UPLOAD_FOLDER = '/tmp/uploads'
 ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff'}
 MAX_FILE_SIZE = 16 * 1024 * 1024  # 16MB
 
-# Create upload folder if it doesn't exist
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['MAX_CONTENT_LENGTH'] = MAX_FILE_SIZE
 
-# Initialize translator
-translator = Translator()
+# Google Cloud Translation settings; credentials come from GOOGLE_APPLICATION_CREDENTIALS
+GOOGLE_CLOUD_PROJECT = os.environ.get('GOOGLE_CLOUD_PROJECT')
+if GOOGLE_CLOUD_PROJECT:
+    TRANSLATION_PARENT = f'projects/{GOOGLE_CLOUD_PROJECT}/locations/global'
+else:
+    # Without a project every Cloud call would fail; skip them instead
+    TRANSLATION_PARENT = None
+    if multiprocessing.current_process().name == 'MainProcess':  # OCR workers re-import this module
+        logger.error("GOOGLE_CLOUD_PROJECT is not set; translation and language detection are disabled")
+
+# Async translation client, created on first use inside the event loop (which also
+# keeps OCR pool workers from opening a channel). It reuses one gRPC channel.
+translation_client = None
+
+# Maximum number of cached translation and language detection results
+TRANSLATION_CACHE_SIZE = 10000
+
+# Maximum number of texts sent in one translation request; batches run concurrently
+TRANSLATION_BATCH_SIZE = 128
+
+# LRU caches keyed by (normalized text, target language) and normalized text.
+# They are only touched from the event loop thread, so they need no lock.
+translation_cache = OrderedDict()
+detection_cache = OrderedDict()
+
+# Image preprocessing parameters
+MAX_IMAGE_SIDE = 1600  # Long-side cap in pixels, roughly 300 DPI for a printed menu
+GAUSSIAN_KERNEL_SIZE = (5, 5)
+ADAPTIVE_THRESH_BLOCK_SIZE = 11
+ADAPTIVE_THRESH_C = 2
+
+# Use OpenCV's CUDA module for preprocessing when a GPU is available
+try:
+    CUDA_AVAILABLE = cv2.cuda.getCudaEnabledDeviceCount() > 0
+except (AttributeError, cv2.error):
+    CUDA_AVAILABLE = False
+
+# CUDA filters, stream and buffers, created on first use. The filters hold
+# compiled GPU kernels and the buffers are pinned or device memory, so they are
+# built once and shared; cuda_lock serialises access to them.
+cuda_resources = None
+cuda_lock = threading.Lock()
+
+# Common price patterns, e.g. "$12.99", "12.99 €", "15 USD"
+PRICE_REGEX = (
+    r'[\$€£¥₹][ \t]*\d+(?:\.\d{2})?|\d+(?:\.\d{2})?[ \t]*[\$€£¥₹]|\d+(?:\.\d{2})?[ \t]*(?:USD|EUR|GBP|JPY|INR)'
+)
+
+# A line ending in a price, optionally preceded by the item name
+MENU_ITEM_PATTERN = regex_engine.compile(
+    r'(?m)^[ \t]*(?:(?P<name>.{3,}?)[ \t]+)?(?P<price>' + PRICE_REGEX + r')[ \t]*$'
+)
+
+# Page segmentation modes to try, most likely to succeed on menus first
+OCR_PAGE_SEG_MODES = [
+    PSM.SINGLE_BLOCK,   # Uniform block of text
+    PSM.SINGLE_COLUMN,  # Single column of text
+    PSM.AUTO,           # Fully automatic page segmentation
+]
+
+# Accented Latin letters used in European dish names, e.g. "Bœuf", "Crème brûlée"
+MENU_ACCENTED_LETTERS = 'àáâäçèéêëíîïñóôöùúûüœ'
+
+# Characters Tesseract may output for menus: ASCII letters and digits, price and
+# menu punctuation, and accented letters in both cases (ß has no single uppercase)
+MENU_CHAR_WHITELIST = (
+    'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+    " .,:!%-$€£¥₹/()&'"
+    + MENU_ACCENTED_LETTERS + MENU_ACCENTED_LETTERS.upper() + 'ß'
+)
+
+# A pass at or above this confidence is used without waiting for the
+# lower-priority modes after it
+OCR_CONFIDENCE_THRESHOLD = 85
+
+# OCR worker pool, created on first use. Workers are spawned rather than forked
+# because the parent is multi-threaded, and they re-import this module, so the
+# pool must not be created at import time.
+OCR_POOL_SIZE = os.cpu_count() or 1
+ocr_pool = None
+ocr_pool_lock = threading.Lock()
+
+# Set when the platform cannot run the pool or share memory with it (serverless
+# hosts may lack /dev/shm or POSIX semaphores); OCR then runs in-process
+ocr_pool_unavailable = shared_memory is None
+
+# Per-process Tesseract engine, set by init_ocr_worker inside each pool worker,
+# or in the server process when OCR runs in-process. TessBaseAPI is not
+# thread-safe, so in-process use must hold worker_tess_api_lock.
+worker_tess_api = None
+worker_tess_api_lock = threading.Lock()
 
 def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and \
            filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def get_cuda_resources():
+    """Return the cached CUDA preprocessing resources, creating them on first use"""
+    global cuda_resources
+    if cuda_resources is None:
+        resources = {
+            'gaussian': cv2.cuda.createGaussianFilter(
+                cv2.CV_8UC1, cv2.CV_8UC1, GAUSSIAN_KERNEL_SIZE, 0
+            ),
+            # Local box mean, as used by ADAPTIVE_THRESH_MEAN_C
+            'local_mean': cv2.cuda.createBoxFilter(
+                cv2.CV_8UC1, cv2.CV_8UC1,
+                (ADAPTIVE_THRESH_BLOCK_SIZE, ADAPTIVE_THRESH_BLOCK_SIZE),
+                borderMode=cv2.BORDER_REPLICATE
+            ),
+            'stream': cv2.cuda_Stream(),
+            'host_buffer': np.empty(MAX_IMAGE_SIDE * MAX_IMAGE_SIDE * 3, np.uint8),
+            # Device buffer reused across requests; reallocated only when the size changes
+            'gpu_image': cv2.cuda_GpuMat(),
+        }
+        # Pin the staging buffer in place so uploads from views of it are DMA
+        # copies on the stream. A HostMem buffer would not help here: reading
+        # it back as a numpy array copies the data into pageable memory.
+        cv2.cuda.registerPageLocked(resources['host_buffer'])
+        cuda_resources = resources
+    return cuda_resources
+
+def preprocess_image_cuda(image):
+    """Preprocess image on the GPU with one upload and one download"""
+    with cuda_lock:
+        resources = get_cuda_resources()
+        stream = resources['stream']
+        
+        # Stage the image in pinned memory as a contiguous view of the shared buffer
+        host_image = resources['host_buffer'][:image.size].reshape(image.shape)
+        np.copyto(host_image, image)
+        
+        gpu_image = resources['gpu_image']
+        gpu_image.upload(host_image, stream)
+        
+        # Convert to grayscale and reduce noise
+        gray = cv2.cuda.cvtColor(gpu_image, cv2.COLOR_BGR2GRAY, stream=stream)
+        blurred = resources['gaussian'].apply(gray, stream=stream)
+        
+        # Adaptive thresholding: keep pixels brighter than their local mean minus C
+        local_mean = resources['local_mean'].apply(blurred, stream=stream)
+        diff = cv2.cuda.subtract(blurred, local_mean, dtype=cv2.CV_16S, stream=stream)
+        _, thresh = cv2.cuda.threshold(diff, -ADAPTIVE_THRESH_C, 255, cv2.THRESH_BINARY, stream=stream)
+        thresh = thresh.convertTo(cv2.CV_8U, stream)
+        
+        result = thresh.download(stream)
+        stream.waitForCompletion()
+        return result
+
 def preprocess_image(image):
     """Preprocess image for better OCR results"""
+    # Downscale oversized photos; OCR time grows with pixel count
+    scale = MAX_IMAGE_SIDE / max(image.shape[:2])
+    if scale < 1.0:
+        image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    
+    if CUDA_AVAILABLE:
+        return preprocess_image_cuda(image)
+    
     # Convert to grayscale
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
-    # Apply Gaussian blur to reduce noise
-    blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+    # Apply Gaussian blur to reduce noise. For a fixed 5x5 kernel with sigma 0,
+    # OpenCV uses a precomputed fixed-point [1 4 6 4 1] kernel, which is faster
+    # than sepFilter2D with a cached float kernel.
+    blurred = cv2.GaussianBlur(gray, GAUSSIAN_KERNEL_SIZE, 0)
     
-    # Apply adaptive thresholding
+    # Apply adaptive thresholding against the local mean, which OpenCV computes
+    # with running box sums (constant cost per pixel, unlike the Gaussian variant)
     thresh = cv2.adaptiveThreshold(
-        blurred, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+        blurred, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY,
+        ADAPTIVE_THRESH_BLOCK_SIZE, ADAPTIVE_THRESH_C
     )
     
-    # Morphological operations to clean up the image
-    kernel = np.ones((1, 1), np.uint8)
-    cleaned = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel)
+    # No morphological cleanup: closing with a 1x1 kernel is an identity pass
+    return thresh
+
+def init_ocr_worker():
+    """Load Tesseract once per pool worker so language data stays in memory"""
+    global worker_tess_api
+    worker_tess_api = PyTessBaseAPI(psm=PSM.SINGLE_BLOCK, oem=OEM.DEFAULT, lang='eng')
+    
+    # Restrict recognition to characters that appear on menus
+    worker_tess_api.SetVariable('tessedit_char_whitelist', MENU_CHAR_WHITELIST)
+    worker_tess_api.SetVariable('preserve_interword_spaces', '1')
+
+def ocr_pass(image_bytes, width, height, psm):
+    """Run one OCR pass with this process's Tesseract engine"""
+    # Hand Tesseract the raw 8-bit pixels; SetImage would PNG-encode a PIL image first
+    worker_tess_api.SetPageSegMode(psm)
+    worker_tess_api.SetImageBytes(image_bytes, width, height, 1, width)
+    text = worker_tess_api.GetUTF8Text()
+    
+    # Calculate average confidence
+    confidences = np.fromiter(worker_tess_api.AllWordConfidences(), dtype=np.int32)
+    confidences = confidences[confidences > 0]
+    avg_confidence = float(confidences.mean()) if confidences.size else 0.0
+    
+    return text, avg_confidence
+
+def ocr_worker(shm_name, shape, psm):
+    """Run one OCR pass on an image held in shared memory"""
+    height, width = shape
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        image_bytes = bytes(shm.buf[:height * width])
+    finally:
+        shm.close()
+    
+    return ocr_pass(image_bytes, width, height, psm)
+
+def get_ocr_pool():
+    """Return the shared OCR worker pool, creating it on first use, or None if unavailable"""
+    global ocr_pool, ocr_pool_unavailable
+    with ocr_pool_lock:
+        if ocr_pool is None and not ocr_pool_unavailable:
+            try:
+                ocr_pool = ProcessPoolExecutor(
+                    max_workers=OCR_POOL_SIZE,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=init_ocr_worker,
+                )
+            except (OSError, ImportError, NotImplementedError) as e:
+                logger.warning(f"OCR worker pool unavailable, running OCR in-process: {e}")
+                ocr_pool_unavailable = True
+        return None if ocr_pool_unavailable else ocr_pool
+
+def reset_ocr_pool(broken_pool):
+    """Discard a broken pool so the next call to get_ocr_pool starts a fresh one"""
+    global ocr_pool
+    with ocr_pool_lock:
+        if ocr_pool is broken_pool:
+            ocr_pool = None
+
+def select_ocr_result(results):
+    """Pick the OCR result from passes finished so far, or None if still undecided.
+    
+    results maps each finished mode to (text, confidence), or None if it failed.
+    Modes are considered in OCR_PAGE_SEG_MODES order and the first one reaching
+    OCR_CONFIDENCE_THRESHOLD ends the search, so the outcome does not depend on
+    which pass finishes first.
+    """
+    best_text = ""
+    best_confidence = 0
+    
+    for psm in OCR_PAGE_SEG_MODES:
+        if psm not in results:
+            return None  # A higher-priority mode could still change the outcome
+        if results[psm] is None:
+            continue
+        
+        text, avg_confidence = results[psm]
+        if avg_confidence > best_confidence:
+            best_confidence = avg_confidence
+            best_text = text
+        
+        if best_confidence >= OCR_CONFIDENCE_THRESHOLD:
+            break
+    
+    return best_text, best_confidence
+
+def run_ocr_in_process(processed_image):
+    """Run the page segmentation modes one after another in this process"""
+    results = {}
+    
+    height, width = processed_image.shape
+    image_bytes = np.ascontiguousarray(processed_image).tobytes()
+    
+    with worker_tess_api_lock:
+        if worker_tess_api is None:
+            init_ocr_worker()
+        
+        for psm in OCR_PAGE_SEG_MODES:
+            try:
+                results[psm] = ocr_pass(image_bytes, width, height, psm)
+            except Exception as e:
+                logger.warning(f"OCR with page segmentation mode {psm} failed: {e}")
+                results[psm] = None
+            
+            selected = select_ocr_result(results)
+            if selected is not None:
+                return selected
+
+async def run_ocr_in_pool(pool, processed_image):
+    """Run every page segmentation mode in parallel on the pool"""
+    results = {}
+    selected = None
+    
+    # Share the image with the workers instead of pickling it once per pass
+    shm = shared_memory.SharedMemory(create=True, size=processed_image.nbytes)
+    futures = {}
+    try:
+        shared_image = np.ndarray(processed_image.shape, dtype=np.uint8, buffer=shm.buf)
+        shared_image[:] = processed_image
+        del shared_image
+        
+        for psm in OCR_PAGE_SEG_MODES:
+            future = pool.submit(ocr_worker, shm.name, processed_image.shape, psm)
+            futures[asyncio.wrap_future(future)] = psm
+        
+        pending = set(futures)
+        while selected is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                psm = futures[future]
+                try:
+                    results[psm] = future.result()
+                except BrokenProcessPool:
+                    # Every other pass fails too; let them finish rather than
+                    # cancelling futures the broken executor is about to fail
+                    if pending:
+                        await asyncio.wait(pending)
+                    raise
+                except Exception as e:
+                    logger.warning(f"OCR with page segmentation mode {psm} failed: {e}")
+                    results[psm] = None
+            
+            selected = select_ocr_result(results)
+    finally:
+        # Drop passes that have not started yet, and collect the errors of any
+        # that will not be read so asyncio does not log them as unhandled
+        for future in futures:
+            if future.done() and not future.cancelled():
+                future.exception()
+            else:
+                future.cancel()
+        shm.close()
+        shm.unlink()
+    
+    return selected
+
+async def run_ocr(processed_image):
+    """Run OCR on the worker pool, or in-process when the pool cannot be used"""
+    global ocr_pool_unavailable
+    loop = asyncio.get_running_loop()
+    
+    for attempt in range(2):
+        pool = get_ocr_pool()
+        if pool is None:
+            break
+        
+        try:
+            return await run_ocr_in_pool(pool, processed_image)
+        except BrokenProcessPool:
+            # A worker died (crash, OOM) or failed to start; replace the pool and
+            # retry once, then let the error surface as a server error
+            logger.error("OCR worker pool is broken, restarting it")
+            reset_ocr_pool(pool)
+            if attempt:
+                raise
+        except OSError as e:
+            # Shared memory could not be created (e.g. no /dev/shm)
+            logger.warning(f"Shared memory unavailable, running OCR in-process: {e}")
+            ocr_pool_unavailable = True
+            break
     
-    return cleaned
+    return await loop.run_in_executor(None, run_ocr_in_process, processed_image)
+
+def get_translation_client():
+    """Return the shared async translation client, creating it on first use"""
+    global translation_client
+    if translation_client is None:
+        translation_client = translate.TranslationServiceAsyncClient()
+    return translation_client
 
-def detect_language(text):
+def normalize_text(text):
+    """Collapse whitespace so equivalent strings share a cache entry"""
+    return ' '.join(text.split())
+
+def cache_get(cache, key):
+    """Look up an LRU cache entry, marking it as recently used"""
+    if key not in cache:
+        return None
+    cache.move_to_end(key)
+    return cache[key]
+
+def cache_put(cache, key, value):
+    """Store an LRU cache entry, evicting the oldest beyond TRANSLATION_CACHE_SIZE"""
+    cache[key] = value
+    cache.move_to_end(key)
+    while len(cache) > TRANSLATION_CACHE_SIZE:
+        cache.popitem(last=False)
+
+async def detect_language(text):
     """Detect the language of the text"""
+    if TRANSLATION_PARENT is None:
+        return 'unknown'
+    
+    text = normalize_text(text)
+    detected_lang = cache_get(detection_cache, text)
+    if detected_lang is not None:
+        return detected_lang
+    
     try:
-        # Use Google Translate to detect language
-        detection = translator.detect(text)
-        return detection.lang
+        # Use Google Cloud Translation to detect language
+        response = await get_translation_client().detect_language(
+            parent=TRANSLATION_PARENT, content=text, mime_type='text/plain'
+        )
+        detected_lang = response.languages[0].language_code
     except Exception as e:
         logger.warning(f"Language detection failed: {e}")
         return 'unknown'
+    
+    cache_put(detection_cache, text, detected_lang)
+    return detected_lang
+
+def menu_text_lines(text):
+    """Split OCR text into stripped lines, dropping very short ones that are likely noise"""
+    lines = [line.strip() for line in text.split('\n')]
+    return [line for line in lines if len(line) >= 3]
+
+def append_description(item, lines):
+    """Add lines to a menu item's description"""
+    if lines:
+        item['description'] = ' '.join([item['description'], *lines] if 'description' in item else lines)
 
 def extract_menu_items(text):
     """Extract potential menu items from OCR text"""
-    # Split text into lines and clean them
-    lines = [line.strip() for line in text.split('\n') if line.strip()]
-    
     menu_items = []
-    current_item = {}
+    previous_end = 0
     
-    for line in lines:
-        # Skip very short lines (likely noise)
-        if len(line) < 3:
-            continue
-            
-        # Check if line contains price (common patterns)
-        price_pattern = r'[\$€£¥₹]\s*\d+(?:\.\d{2})?|\d+(?:\.\d{2})?\s*[\$€£¥₹]|\d+(?:\.\d{2})?\s*(?:USD|EUR|GBP|JPY|INR)'
-        has_price = bool(re.search(price_pattern, line))
-        
-        # Check if line looks like a description (longer text, no price)
-        is_description = len(line) > 20 and not has_price
-        
-        if has_price and current_item:
-            # This line has a price, complete the current item
-            current_item['price'] = re.search(price_pattern, line).group()
-            current_item['full_text'] = current_item.get('name', '') + ' ' + line
-            menu_items.append(current_item)
-            current_item = {}
-        elif is_description and not current_item:
-            # This looks like a description, start a new item
-            current_item = {'description': line}
-        elif not has_price and not is_description:
-            # This looks like an item name
-            if current_item:
-                current_item['name'] = line
-            else:
-                current_item = {'name': line}
+    for match in MENU_ITEM_PATTERN.finditer(text):
+        # Unpriced lines between two priced lines
+        lines = menu_text_lines(text[previous_end:match.start()])
+        previous_end = match.end()
+        
+        item = {'price': match.group('price'), 'full_text': match.group().strip()}
+        
+        name = match.group('name')
+        if name is None and lines:
+            # Price on its own line: the line just above it is the item name
+            name = lines.pop()
+            item['full_text'] = name + ' ' + item['full_text']
+        if name:
+            item['name'] = name.strip()
+        
+        # The remaining lines describe the previous item, or this one if it is the first
+        append_description(menu_items[-1] if menu_items else item, lines)
+        menu_items.append(item)
     
-    # Add the last item if it exists
-    if current_item:
-        menu_items.append(current_item)
+    # Lines after the last price describe the last item
+    if menu_items:
+        append_description(menu_items[-1], menu_text_lines(text[previous_end:]))
     
     return menu_items
 
-def translate_text(text, target_lang='en'):
-    """Translate text to target language"""
-    try:
-        if target_lang == 'en':
-            return text  # Already in English or no translation needed
-        
-        result = translator.translate(text, dest=target_lang)
-        return result.text
-    except Exception as e:
-        logger.warning(f"Translation failed: {e}")
-        return text
+async def translate_batch(texts, target_lang):
+    """Translate one batch of texts with a single API call"""
+    response = await get_translation_client().translate_text(
+        parent=TRANSLATION_PARENT,
+        contents=texts,
+        target_language_code=target_lang,
+        mime_type='text/plain',
+    )
+    return [translation.translated_text for translation in response.translations]
+
+async def translate_texts(texts, target_lang='en'):
+    """Translate a list of texts to target language, batching cache misses"""
+    if target_lang == 'en' or TRANSLATION_PARENT is None:
+        return list(texts)  # Already in English, or translation is not configured
+    
+    keys = [(normalize_text(text), target_lang) for text in texts]
+    results = {}
+    for key in keys:
+        translation = cache_get(translation_cache, key)
+        if translation is not None:
+            results[key] = translation
+    
+    # Send each distinct cache miss once, with all batches in flight concurrently
+    misses = list(dict.fromkeys(key for key in keys if key not in results))
+    batches = [misses[i:i + TRANSLATION_BATCH_SIZE] for i in range(0, len(misses), TRANSLATION_BATCH_SIZE)]
+    responses = await asyncio.gather(
+        *(translate_batch([text for text, _ in batch], target_lang) for batch in batches),
+        return_exceptions=True
+    )
+    
+    for batch, translations in zip(batches, responses):
+        if isinstance(translations, Exception):
+            logger.warning(f"Translation failed: {translations}")
+            continue
+        for key, translation in zip(batch, translations):
+            results[key] = translation
+            cache_put(translation_cache, key, translation)
+    
+    # Fall back to the original text for anything that failed to translate
+    return [results.get(key, text) for key, text in zip(keys, texts)]
 
 @app.route('/api/ocr', methods=['POST'])
-def ocr_endpoint():
+async def ocr_endpoint():
     """Main OCR endpoint for processing menu images"""
     try:
         # Check if file is present
-        if 'file' not in request.files:
+        files = await request.files
+        if 'file' not in files:
             return jsonify({'error': 'No file provided'}), 400
         
-        file = request.files['file']
+        file = files['file']
         if file.filename == '':
             return jsonify({'error': 'No file selected'}), 400
         
@@ -133,99 +543,64 @@ def ocr_endpoint():
             return jsonify({'error': 'Invalid file type'}), 400
         
         # Get target language from request
-        target_lang = request.form.get('target_lang', 'en')
+        form = await request.form
+        target_lang = form.get('target_lang', 'en')
         
-        # Save uploaded file
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-        file.save(filepath)
+        # Decode and preprocess in a worker thread so the event loop stays free
+        loop = asyncio.get_running_loop()
+        image_bytes = np.frombuffer(file.read(), dtype=np.uint8)
+        image = await loop.run_in_executor(None, cv2.imdecode, image_bytes, cv2.IMREAD_COLOR)
+        if image is None:
+            return jsonify({'error': 'Could not read image file'}), 400
+        
+        processed_image = await loop.run_in_executor(None, preprocess_image, image)
+        
+        # Perform OCR with multiple page segmentation modes for better results
+        best_text, best_confidence = await run_ocr(processed_image)
+        
+        if not best_text.strip():
+            return jsonify({'error': 'No text detected in image'}), 400
+        
+        # Detect language
+        detected_lang = await detect_language(best_text)
+        
+        # Extract menu items
+        menu_items = extract_menu_items(best_text)
+        
+        # Translate menu items if target language is specified
+        if target_lang != 'en' and detected_lang != target_lang:
+            # Translate all names and descriptions in batched requests
+            fields = [(item, key) for item in menu_items for key in ['name', 'description'] if key in item]
+            translations = await translate_texts([item[key] for item, key in fields], target_lang)
+            for (item, key), translation in zip(fields, translations):
+                item[f'{key}_translated'] = translation
+        
+        # Prepare response
+        response = {
+            'success': True,
+            'detected_language': detected_lang,
+            'target_language': target_lang,
+            'confidence': best_confidence,
+            'raw_text': best_text,
+            'menu_items': menu_items,
+            'total_items': len(menu_items)
+        }
+        
+        return jsonify(response)
         
-        try:
-            # Read and preprocess image
-            image = cv2.imread(filepath)
-            if image is None:
-                return jsonify({'error': 'Could not read image file'}), 400
-            
-            processed_image = preprocess_image(image)
-            
-            # Perform OCR with multiple languages
-            # Try different OCR configurations for better results
-            ocr_configs = [
-                '--oem 3 --psm 6',  # Uniform block of text
-                '--oem 3 --psm 4',  # Single column of text
-                '--oem 3 --psm 3',  # Fully automatic page segmentation
-            ]
-            
-            best_text = ""
-            best_confidence = 0
-            
-            for config in ocr_configs:
-                try:
-                    # Get OCR data with confidence scores
-                    data = pytesseract.image_to_data(processed_image, config=config, output_type=pytesseract.Output.DICT)
-                    
-                    # Calculate average confidence
-                    confidences = [int(conf) for conf in data['conf'] if int(conf) > 0]
-                    avg_confidence = sum(confidences) / len(confidences) if confidences else 0
-                    
-                    # Get text
-                    text = pytesseract.image_to_string(processed_image, config=config)
-                    
-                    if avg_confidence > best_confidence:
-                        best_confidence = avg_confidence
-                        best_text = text
-                        
-                except Exception as e:
-                    logger.warning(f"OCR config {config} failed: {e}")
-                    continue
-            
-            if not best_text.strip():
-                return jsonify({'error': 'No text detected in image'}), 400
-            
-            # Detect language
-            detected_lang = detect_language(best_text)
-            
-            # Extract menu items
-            menu_items = extract_menu_items(best_text)
-            
-            # Translate menu items if target language is specified
-            if target_lang != 'en' and detected_lang != target_lang:
-                for item in menu_items:
-                    for key in ['name', 'description']:
-                        if key in item:
-                            item[f'{key}_translated'] = translate_text(item[key], target_lang)
-            
-            # Prepare response
-            response = {
-                'success': True,
-                'detected_language': detected_lang,
-                'target_language': target_lang,
-                'confidence': best_confidence,
-                'raw_text': best_text,
-                'menu_items': menu_items,
-                'total_items': len(menu_items)
-            }
-            
-            return jsonify(response)
-            
-        finally:
-            # Clean up uploaded file
-            if os.path.exists(filepath):
-                os.remove(filepath)
-                
     except Exception as e:
         logger.error(f"OCR processing failed: {e}")
         return jsonify({'error': f'Processing failed: {str(e)}'}), 500
 
 @app.route('/api/health', methods=['GET'])
-def health_check():
+async def health_check():
     """Health check endpoint"""
     return jsonify({'status': 'healthy', 'service': 'OCR Menu Detector'})
 
 @app.route('/', methods=['GET'])
-def index():
+async def index():
     """Serve the main page"""
-    return render_template('index.html')
+    return await render_template('index.html')
 
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,38 @@
+import unittest
+
+from api.ocr import extract_menu_items
+
+
+class ExtractMenuItemsTest(unittest.TestCase):
+    def test_description_follows_inline_priced_item(self):
+        items = extract_menu_items("Burger $10\nJuicy beef patty with cheese\nFries $4\nSalted")
+        self.assertEqual(items, [
+            {'price': '$10', 'full_text': 'Burger $10', 'name': 'Burger',
+             'description': 'Juicy beef patty with cheese'},
+            {'price': '$4', 'full_text': 'Fries $4', 'name': 'Fries', 'description': 'Salted'},
+        ])
+    
+    def test_name_above_standalone_price(self):
+        items = extract_menu_items(
+            "Spring Rolls  $5.99\nCrispy rolls with sweet chili sauce\nSoup\n$4.50\nTomato and basil"
+        )
+        self.assertEqual(items, [
+            {'price': '$5.99', 'full_text': 'Spring Rolls  $5.99', 'name': 'Spring Rolls',
+             'description': 'Crispy rolls with sweet chili sauce'},
+            {'price': '$4.50', 'full_text': 'Soup $4.50', 'name': 'Soup', 'description': 'Tomato and basil'},
+        ])
+    
+    def test_lines_before_first_item_describe_it(self):
+        items = extract_menu_items("Fresh from the garden\nGarden Salad\n7.50 €\nChicken Wings 9 USD")
+        self.assertEqual(items, [
+            {'price': '7.50 €', 'full_text': 'Garden Salad 7.50 €', 'name': 'Garden Salad',
+             'description': 'Fresh from the garden'},
+            {'price': '9 USD', 'full_text': 'Chicken Wings 9 USD', 'name': 'Chicken Wings'},
+        ])
+    
+    def test_text_without_prices(self):
+        self.assertEqual(extract_menu_items("Welcome\nOpen daily"), [])
+
+
+if __name__ == '__main__':
+    unittest.main()